@@ -0,0 +1,173 @@
+"""Production ASGI entry point.
+
+Prepare the database once, then start as many workers as needed:
+
+    flask --app app init-db
+    uvicorn asgi:application --workers 4
+
+Requires asgiref, plus aiosqlite (SQLite) or asyncpg (PostgreSQL).
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy as sa
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.datastructures import Headers
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app import app, db, apply_sqlite_pragmas, engagement_buffer, notification_queue, warm_trending
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg'
+}
+
+# Read endpoints served on the event loop. Each request runs the ordinary
+# Flask view inside AsyncSession.run_sync, so the views, serializers and
+# hooks are shared with the WSGI app while every query is awaited on the
+# async driver. The event stream is set up the same way and then sent from
+# the broker on the event loop, so an open stream holds no thread. Everything
+# else goes to the WSGI app on a thread pool.
+ASYNC_ENDPOINTS = {'tweets', 'search', 'get_notifications', 'get_user_tweets', 'get_thread', 'stream'}
+
+# asgiref runs every WSGI request of a worker on one shared thread, so a
+# single slow request would hold up the rest; these get WSGI_THREADS instead
+WSGI_THREADS = int(os.environ.get('WSGI_THREADS', 32))
+wsgi_executor = ThreadPoolExecutor(WSGI_THREADS, thread_name_prefix='wsgi')
+
+class ThreadPoolWsgiInstance(WsgiToAsgiInstance):
+    run_wsgi_app = sync_to_async(
+        WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, thread_sensitive=False, executor=wsgi_executor
+    )
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await ThreadPoolWsgiInstance(self.wsgi_application, self.duplicate_header_limit)(scope, receive, send)
+
+def create_engine():
+    with app.app_context():
+        url = db.engine.url
+    engine = create_async_engine(
+        url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]),
+        **app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    )
+    if url.get_backend_name() == 'sqlite':
+        event.listen(engine.sync_engine, 'connect', lambda dbapi_connection, record: apply_sqlite_pragmas(dbapi_connection))
+    return engine
+
+engine = create_engine()
+sessions = async_sessionmaker(engine, expire_on_commit=False)
+wsgi_application = ThreadPoolWsgiToAsgi(app)
+urls = app.url_map.bind('localhost')
+
+def app_path(scope):
+    return scope['path'][len(scope.get('root_path', '')):]
+
+def is_async_request(scope):
+    if scope['type'] != 'http' or scope['method'] != 'GET':
+        return False
+    try:
+        endpoint, _ = urls.match(app_path(scope), 'GET')
+    except HTTPException:
+        return False
+    return endpoint in ASYNC_ENDPOINTS
+
+def wsgi_environ(scope):
+    headers = Headers([(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']])
+    host = headers.get('Host') or '{}:{}'.format(*scope.get('server') or ('localhost', 80))
+    client = scope.get('client') or ('127.0.0.1', 0)
+    return EnvironBuilder(
+        path=app_path(scope),
+        base_url=f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}",
+        query_string=scope['query_string'].decode('latin-1'),
+        headers=headers,
+        environ_overrides={
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': client[1],
+            'twitter.event_loop': asyncio.get_running_loop()
+        }
+    ).get_environ()
+
+def dispatch(session, environ):
+    # Runs in SQLAlchemy's greenlet: db.session resolves to the async
+    # session's sync facade for the duration of the request
+    with app.request_context(environ):
+        db.session.registry.set(session)
+        try:
+            try:
+                response = app.full_dispatch_request()
+            except Exception as error:
+                response = app.handle_exception(error)
+            # An async body (the event stream) is sent by the caller
+            body = response.response if hasattr(response.response, '__aiter__') else response.get_data()
+            return response.status_code, list(response.headers.items()), body
+        finally:
+            db.session.registry.clear()
+
+async def read_application(scope, receive, send):
+    async with sessions() as session:
+        status, headers, body = await session.run_sync(dispatch, wsgi_environ(scope))
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+    })
+    if isinstance(body, bytes):
+        await send({'type': 'http.response.body', 'body': body})
+    else:
+        await send_stream(body, receive, send)
+
+async def send_stream(body, receive, send):
+    # Sends chunks as they are produced until the client disconnects; the
+    # database session is already closed by then
+    async def produce():
+        async for chunk in body:
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+    
+    async def disconnected():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+    
+    tasks = [asyncio.ensure_future(produce()), asyncio.ensure_future(disconnected())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await body.aclose()
+
+async def lifespan(receive, send):
+    # Per-worker state only; the schema and seed data are set up by init-db
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                with app.app_context():
+                    if not sa.inspect(db.engine).has_table('tweet'):
+                        raise RuntimeError('Database is not initialized; run `flask --app app init-db` first')
+                    warm_trending()
+            except Exception as error:
+                await send({'type': 'lifespan.startup.failed', 'message': str(error)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            with app.app_context():
+                engagement_buffer.drain()
+                notification_queue.drain()
+            await engine.dispose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif is_async_request(scope):
+        await read_application(scope, receive, send)
+    else:
+        await wsgi_application(scope, receive, send)
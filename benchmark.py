@@ -0,0 +1,495 @@
+"""Synthetic data generator and API benchmark.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmark.py generate --users 20000 --tweets 1000000
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmark.py run --save baseline.json
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmark.py run --compare baseline.json
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmark.py login --threads 16
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from bisect import bisect
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from flask_migrate import upgrade as upgrade_schema
+from sqlalchemy import event
+
+from app import (
+    app, db, User, Tweet, Like, Retweet, Notification, NotificationActor, followers, notification_message,
+    reconcile_counters, rebuild_feeds, compute_suggestions, warm_trending
+)
+
+WORDS = (
+    'just shipped new feature today love team coffee code design product launch '
+    'debugging weekend thoughts build learning open source api data model users '
+    'growth startup music travel photo morning night city running book reading '
+    'game match football weather release update performance database cloud'
+).split()
+
+HASHTAGS = (
+    'WebDev Python JavaScript AI MachineLearning StartupLife Design UXDesign '
+    'DevLife Music Travel Photography Football Coffee OpenSource Cloud Data React'
+).split()
+
+BATCH_SIZE = 10000
+PASSWORD = 'password123'
+
+# Data generation
+# Follower in-degree, posting activity and tweet engagement all follow
+# power laws: a few accounts are followed by a large share of users, a few
+# users post most tweets, and a few tweets collect most likes.
+def pareto_weights(rng, count, alpha):
+    return [rng.paretovariate(alpha) for _ in range(count)]
+
+def cumulative(weights):
+    return list(itertools.accumulate(weights))
+
+def pick(rng, population, cum_weights):
+    return population[bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+def insert_rows(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(db.insert(model), rows[start:start + BATCH_SIZE])
+    db.session.commit()
+
+def next_id(column):
+    return (db.session.scalar(db.select(db.func.max(column))) or 0) + 1
+
+def generate_users(rng, count, now, days):
+    # Every generated account shares one password so logins stay cheap to set up
+    template = User(username='template', email='template')
+    template.set_password(PASSWORD)
+    first_id = next_id(User.id)
+    rows = []
+    for user_id in range(first_id, first_id + count):
+        rows.append({
+            'id': user_id,
+            'username': f'user{user_id}',
+            'email': f'user{user_id}@example.com',
+            'password_hash': template.password_hash,
+            'display_name': f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {user_id}',
+            'bio': ' '.join(rng.choices(WORDS, k=6)),
+            'created_at': now - timedelta(days=days, seconds=rng.randrange(86400 * days))
+        })
+    insert_rows(User, rows)
+    return [row['id'] for row in rows]
+
+def generate_follows(rng, user_ids, average, popularity, now, days):
+    # Out-degrees are Pareto distributed around the requested average; targets
+    # are drawn by popularity so in-degrees are heavy-tailed too
+    cum_popularity = cumulative(popularity)
+    scale = average * (1.5 - 1) / 1.5
+    edges = []
+    for user_id in user_ids:
+        degree = min(len(user_ids) - 1, int(scale * rng.paretovariate(1.5)))
+        targets = set()
+        for _ in range(degree * 2):
+            if len(targets) >= degree:
+                break
+            target = pick(rng, user_ids, cum_popularity)
+            if target != user_id:
+                targets.add(target)
+        for target in targets:
+            edges.append((user_id, target, now - timedelta(seconds=rng.randrange(86400 * days))))
+    
+    for start in range(0, len(edges), BATCH_SIZE):
+        db.session.execute(followers.insert(), [
+            {'follower_id': follower_id, 'followed_id': followed_id}
+            for follower_id, followed_id, _ in edges[start:start + BATCH_SIZE]
+        ])
+    db.session.commit()
+    return edges
+
+def tweet_content(rng):
+    words = rng.choices(WORDS, k=rng.randint(5, 30))
+    for _ in range(int(rng.paretovariate(2)) - 1):
+        words.append('#' + HASHTAGS[min(int(rng.paretovariate(1.2)) - 1, len(HASHTAGS) - 1)])
+    return ' '.join(words)[:280]
+
+def generate_tweets(rng, user_ids, count, activity, now, days):
+    # Inserted oldest first, so ids follow created_at as they do in production
+    cum_activity = cumulative(activity)
+    timestamps = sorted(now - timedelta(seconds=rng.randrange(86400 * days)) for _ in range(count))
+    first_id = next_id(Tweet.id)
+    tweets = []
+    for start in range(0, count, BATCH_SIZE):
+        rows = [{
+            'id': first_id + index,
+            'user_id': pick(rng, user_ids, cum_activity),
+            'content': tweet_content(rng),
+            'created_at': timestamps[index]
+        } for index in range(start, min(start + BATCH_SIZE, count))]
+        db.session.execute(db.insert(Tweet), rows)
+        db.session.commit()
+        tweets.extend((row['id'], row['user_id'], row['created_at']) for row in rows)
+    return tweets
+
+def generate_engagement(rng, model, user_ids, tweets, count, activity, reach, now):
+    # Tweets from widely followed authors draw more engagement, and within
+    # that a heavy tail of tweets goes viral
+    cum_activity = cumulative(activity)
+    cum_virality = cumulative([reach[author_id] * rng.paretovariate(1.3) for _, author_id, _ in tweets])
+    seen = set()
+    rows = []
+    for _ in range(count * 2):
+        if len(rows) >= count:
+            break
+        tweet_id, author_id, created_at = pick(rng, tweets, cum_virality)
+        user_id = pick(rng, user_ids, cum_activity)
+        if user_id == author_id or (user_id, tweet_id) in seen:
+            continue
+        seen.add((user_id, tweet_id))
+        rows.append({
+            'user_id': user_id,
+            'tweet_id': tweet_id,
+            'created_at': min(now, created_at + timedelta(seconds=int(rng.expovariate(1 / 3600))))
+        })
+    insert_rows(model, rows)
+    return rows
+
+def generate_notifications(rng, type, events, now):
+    # One coalesced notification per recipient, tweet and day, as the
+    # notification worker would have left them
+    names = dict(db.session.execute(db.select(User.id, User.display_name)).all())
+    groups = defaultdict(list)
+    for recipient_id, actor_id, tweet_id, created_at in events:
+        groups[(recipient_id, tweet_id, created_at.date())].append((created_at, actor_id))
+    
+    rows = []
+    actor_rows = []
+    for notification_id, ((recipient_id, tweet_id, _), actors) in enumerate(groups.items(), next_id(Notification.id)):
+        created_at, actor_id = max(actors)
+        actor_ids = {actor_id for _, actor_id in actors}
+        rows.append({
+            'id': notification_id,
+            'user_id': recipient_id,
+            'from_user_id': actor_id,
+            'tweet_id': tweet_id,
+            'type': type,
+            'message': notification_message(type, names[actor_id], len(actor_ids)),
+            'read': now - created_at > timedelta(days=2) or rng.random() < 0.5,
+            'created_at': created_at,
+            'actor_count': len(actor_ids)
+        })
+        actor_rows.extend({'notification_id': notification_id, 'user_id': actor_id} for actor_id in actor_ids)
+    insert_rows(Notification, rows)
+    insert_rows(NotificationActor, actor_rows)
+    return len(rows)
+
+def generate(users, tweets, likes, retweets, average_following, days, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    
+    def report(message):
+        print(f'[{time.perf_counter() - started:7.1f}s] {message}')
+    
+    user_ids = generate_users(rng, users, now, days)
+    report(f'{len(user_ids)} users')
+    
+    popularity = pareto_weights(rng, len(user_ids), 1.1)
+    activity = pareto_weights(rng, len(user_ids), 1.5)
+    edges = generate_follows(rng, user_ids, average_following, popularity, now, days)
+    report(f'{len(edges)} follows')
+    
+    tweet_rows = generate_tweets(rng, user_ids, tweets, activity, now, days)
+    report(f'{len(tweet_rows)} tweets')
+    
+    reach = defaultdict(lambda: 1)
+    for _, followed_id, _ in edges:
+        reach[followed_id] += 1
+    authors = {tweet_id: author_id for tweet_id, author_id, _ in tweet_rows}
+    like_rows = generate_engagement(rng, Like, user_ids, tweet_rows, likes, activity, reach, now)
+    report(f'{len(like_rows)} likes')
+    retweet_rows = generate_engagement(rng, Retweet, user_ids, tweet_rows, retweets, activity, reach, now)
+    report(f'{len(retweet_rows)} retweets')
+    
+    count = generate_notifications(rng, 'follow', [
+        (followed_id, follower_id, None, created_at) for follower_id, followed_id, created_at in edges
+    ], now)
+    for type, rows in (('like', like_rows), ('retweet', retweet_rows)):
+        count += generate_notifications(rng, type, [
+            (authors[row['tweet_id']], row['user_id'], row['tweet_id'], row['created_at']) for row in rows
+        ], now)
+    report(f'{count} notifications')
+    
+    reconcile_counters()
+    report('counters reconciled')
+    rebuild_feeds()
+    report('feeds rebuilt')
+    compute_suggestions(full=True)
+    report('suggestions computed')
+
+# Benchmark
+# Requests go through the real routes via the test client as a sample of
+# users spread across the follower distribution. Only statements issued by
+# the benchmarking thread are counted, not the notification worker's.
+class QueryCounter:
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.count = 0
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self.thread_id:
+            self.count += 1
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def sample_users(count):
+    # Evenly spaced through the follower ranking, so celebrities, regular
+    # accounts and lurkers are all represented
+    ranked = db.session.scalars(db.select(User.id).order_by(User.followers_count.desc(), User.id)).all()
+    step = max(1, len(ranked) // count)
+    return ranked[::step][:count]
+
+def scenarios(rng, tweet_ids, user_ids):
+    def home_page(client, user):
+        return client.get('/api/tweets')
+    
+    def home_next_page(client, user):
+        cursor = client.get('/api/tweets').get_json()['next_cursor']
+        return client.get('/api/tweets', query_string={'before': cursor} if cursor else {})
+    
+    def user_tweets(client, user):
+        return client.get(f'/api/users/user{rng.choice(user_ids)}/tweets')
+    
+    def search(client, user):
+        return client.get('/api/search', query_string={'q': rng.choice(WORDS + HASHTAGS)})
+    
+    def notifications(client, user):
+        return client.get('/api/notifications')
+    
+    def suggested_users(client, user):
+        return client.get('/api/suggested-users')
+    
+    def trending(client, user):
+        return client.get('/api/trending')
+    
+    # Posting fans the tweet out to the author's followers; unlike the
+    # toggles below, each run leaves its tweets behind
+    def post_tweet(client, user):
+        return client.post('/api/tweets', json={'content': tweet_content(rng)})
+    
+    # Toggles are issued in pairs so a run leaves the data as it found it
+    def like_toggle(client, user):
+        tweet_id = rng.choice(tweet_ids)
+        client.post(f'/api/tweets/{tweet_id}/like')
+        return client.post(f'/api/tweets/{tweet_id}/like')
+    
+    def follow_toggle(client, user):
+        user_id = rng.choice(user_ids)
+        while user_id == user:
+            user_id = rng.choice(user_ids)
+        client.post(f'/api/users/{user_id}/follow')
+        return client.post(f'/api/users/{user_id}/follow')
+    
+    return {
+        'GET /api/tweets': (home_page, 1),
+        'GET /api/tweets?before': (home_next_page, 2),
+        'GET /api/users/<username>/tweets': (user_tweets, 1),
+        'GET /api/search': (search, 1),
+        'GET /api/notifications': (notifications, 1),
+        'GET /api/suggested-users': (suggested_users, 1),
+        'GET /api/trending': (trending, 1),
+        'POST /api/tweets': (post_tweet, 1),
+        'POST /api/tweets/<id>/like': (like_toggle, 2),
+        'POST /api/users/<id>/follow': (follow_toggle, 2),
+    }
+
+def run(requests_per_endpoint, user_count, warmup, seed):
+    rng = random.Random(seed)
+    with app.app_context():
+        warm_trending()
+        sessions = sample_users(user_count)
+        tweet_ids = db.session.scalars(db.select(Tweet.id).order_by(db.func.random()).limit(10000)).all()
+        user_ids = db.session.scalars(db.select(User.id).order_by(db.func.random()).limit(10000)).all()
+        engine = db.engine
+    
+    clients = []
+    for user_id in sessions:
+        client = app.test_client()
+        response = client.post('/api/login', json={'username': f'user{user_id}', 'password': PASSWORD})
+        if response.status_code != 200:
+            sys.exit(f'Cannot log in as user{user_id}; run the generate command first.')
+        clients.append((client, user_id))
+    
+    results = {}
+    counter = QueryCounter()
+    for name, (scenario, requests_per_call) in scenarios(rng, tweet_ids, user_ids).items():
+        for _ in range(warmup):
+            scenario(*rng.choice(clients))
+        
+        latencies = []
+        queries = []
+        event.listen(engine, 'before_cursor_execute', counter)
+        try:
+            started = time.perf_counter()
+            for _ in range(requests_per_endpoint):
+                client, user_id = rng.choice(clients)
+                counter.count = 0
+                request_started = time.perf_counter()
+                response = scenario(client, user_id)
+                latencies.append((time.perf_counter() - request_started) / requests_per_call)
+                queries.append(counter.count / requests_per_call)
+                if response.status_code != 200:
+                    sys.exit(f'{name} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(engine, 'before_cursor_execute', counter)
+        
+        results[name] = {
+            'requests': requests_per_endpoint * requests_per_call,
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'throughput': round(requests_per_endpoint * requests_per_call / elapsed, 1),
+            'queries': round(statistics.mean(queries), 2),
+            'max_queries': max(queries)
+        }
+    return results
+
+# Login load
+# Sign-in threads hammer /api/login while a reader pages its home timeline,
+# first alone and then alongside the burst, to show that password hashing is
+# bounded by the worker pool rather than starving other requests.
+def timeline_latencies(client, stop):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        client.get('/api/tweets')
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def run_login(threads, duration):
+    with app.app_context():
+        usernames = [f'user{user_id}' for user_id in sample_users(threads + 1)]
+    reader = app.test_client()
+    if reader.post('/api/login', json={'username': usernames[0], 'password': PASSWORD}).status_code != 200:
+        sys.exit(f'Cannot log in as {usernames[0]}; run the generate command first.')
+    
+    def measure_reader(stop):
+        timer = threading.Timer(duration, stop.set)
+        timer.start()
+        return timeline_latencies(reader, stop)
+    
+    idle = measure_reader(threading.Event())
+    
+    stop = threading.Event()
+    logins = []
+    statuses = Counter()
+    lock = threading.Lock()
+    
+    def sign_in(username):
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.post('/api/login', json={'username': username, 'password': PASSWORD})
+            elapsed = time.perf_counter() - started
+            with lock:
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    logins.append(elapsed)
+            if response.status_code == 503:
+                # Clients are expected to honour Retry-After rather than spin
+                stop.wait(float(response.headers.get('Retry-After', 1)))
+    
+    workers = [threading.Thread(target=sign_in, args=(username,)) for username in usernames[1:threads + 1]]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    loaded = measure_reader(stop)
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    
+    print(f'{len(workers)} sign-in threads for {elapsed:.1f}s, {app.config["PASSWORD_WORKERS"]} password workers')
+    print(f'logins: {len(logins) / elapsed:.1f}/s, p50 {percentile(logins, 0.5) * 1000:.1f} ms, '
+          f'p99 {percentile(logins, 0.99) * 1000:.1f} ms' if logins else 'logins: none succeeded')
+    print('responses: ' + ', '.join(f'{status}: {count}' for status, count in sorted(statuses.items())))
+    for label, latencies in (('idle', idle), ('during logins', loaded)):
+        print(f'GET /api/tweets {label}: p50 {percentile(latencies, 0.5) * 1000:.1f} ms, '
+              f'p99 {percentile(latencies, 0.99) * 1000:.1f} ms over {len(latencies)} requests')
+
+def print_results(results):
+    print(f"{'endpoint':36} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>8} {'max':>5}")
+    for name, result in results.items():
+        print(
+            f"{name:36} {result['requests']:>8} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+            f"{result['throughput']:>8.1f} {result['queries']:>8.2f} {result['max_queries']:>5g}"
+        )
+
+def regressions(results, baseline, tolerance):
+    # Query counts must not grow at all and median latency may drift within
+    # the tolerance; p99 is too noisy over a few hundred requests to gate on
+    found = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result['max_queries'] > previous['max_queries']:
+            found.append(f"{name}: up to {result['max_queries']:g} queries per request, was {previous['max_queries']:g}")
+        if result['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+            found.append(f"{name}: p50 {result['p50_ms']} ms, was {previous['p50_ms']} ms")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    generate_parser = commands.add_parser('generate', help='Add a synthetic social graph to the database.')
+    generate_parser.add_argument('--users', type=int, default=10000)
+    generate_parser.add_argument('--tweets', type=int, default=200000)
+    generate_parser.add_argument('--likes', type=int, default=1000000)
+    generate_parser.add_argument('--retweets', type=int, default=100000)
+    generate_parser.add_argument('--average-following', type=int, default=50)
+    generate_parser.add_argument('--days', type=int, default=30, help='Spread activity over this many days.')
+    generate_parser.add_argument('--seed', type=int, default=1)
+    
+    run_parser = commands.add_parser('run', help='Benchmark the API against the current database.')
+    run_parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+    run_parser.add_argument('--users', type=int, default=20, help='Logged-in users to spread requests over.')
+    run_parser.add_argument('--warmup', type=int, default=20)
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--save', metavar='FILE', help='Write the results as a JSON baseline.')
+    run_parser.add_argument('--compare', metavar='FILE', help='Fail on regressions against a saved baseline.')
+    run_parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed latency increase (default 25%%).')
+    
+    login_parser = commands.add_parser('login', help='Measure sign-in throughput under concurrent load.')
+    login_parser.add_argument('--threads', type=int, default=16, help='Concurrent sign-in loops.')
+    login_parser.add_argument('--duration', type=float, default=5, help='Seconds to run each phase.')
+    
+    args = parser.parse_args()
+    # A handful of simulated users would exhaust their request budgets at once
+    app.config['RATE_LIMITING'] = False
+    if args.command == 'generate':
+        with app.app_context():
+            # Through the migrations, so the database can be upgraded later
+            upgrade_schema()
+            generate(args.users, args.tweets, args.likes, args.retweets, args.average_following, args.days, args.seed)
+        return
+    if args.command == 'login':
+        run_login(args.threads, args.duration)
+        return
+    
+    results = run(args.requests, args.users, args.warmup, args.seed)
+    print_results(results)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for regression in found:
+            print(f'REGRESSION {regression}')
+        if found:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""engagement counters, feeds, notifications and indexes
+
+Adds the denormalized counter columns, the feed_entry home timeline store,
+notification coalescing columns, the indexes behind every hot query and a
+primary key on followers, then backfills counters, feeds and the SQLite
+full-text search index from the existing rows.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 19:11:16.190221
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the full-text search DDL as of this revision
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tweet_fts USING fts5(
+        content, content='tweet', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS tweet_fts_ai AFTER INSERT ON tweet BEGIN
+        INSERT INTO tweet_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tweet_fts_ad AFTER DELETE ON tweet BEGIN
+        INSERT INTO tweet_fts(tweet_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tweet_fts_au AFTER UPDATE OF content ON tweet BEGIN
+        INSERT INTO tweet_fts(tweet_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO tweet_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS user_fts USING fts5(
+        username, display_name, content='user', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_fts(rowid, username, display_name) VALUES (new.id, new.username, new.display_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_fts(user_fts, rowid, username, display_name) VALUES ('delete', old.id, old.username, old.display_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_au AFTER UPDATE OF username, display_name ON "user" BEGIN
+        INSERT INTO user_fts(user_fts, rowid, username, display_name) VALUES ('delete', old.id, old.username, old.display_name);
+        INSERT INTO user_fts(rowid, username, display_name) VALUES (new.id, new.username, new.display_name);
+    END""",
+]
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('feed_entry',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('tweet_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['tweet_id'], ['tweet.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'tweet_id')
+    )
+    with op.batch_alter_table('feed_entry', schema=None) as batch_op:
+        batch_op.create_index('ix_feed_entry_user_author', ['user_id', 'author_id'], unique=False)
+        batch_op.create_index('ix_feed_entry_user_created', ['user_id', 'created_at', 'tweet_id'], unique=False)
+
+    # Duplicate follows were possible before followers had a primary key
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute(
+            'DELETE FROM followers WHERE rowid NOT IN '
+            '(SELECT MIN(rowid) FROM followers GROUP BY follower_id, followed_id)'
+        )
+    elif bind.dialect.name == 'postgresql':
+        op.execute(
+            'DELETE FROM followers a USING followers b '
+            'WHERE a.ctid < b.ctid AND a.follower_id = b.follower_id AND a.followed_id = b.followed_id'
+        )
+    op.execute('DELETE FROM followers WHERE follower_id IS NULL OR followed_id IS NULL')
+
+    with op.batch_alter_table('followers', schema=None) as batch_op:
+        batch_op.alter_column('follower_id',
+               existing_type=sa.INTEGER(),
+               nullable=False)
+        batch_op.alter_column('followed_id',
+               existing_type=sa.INTEGER(),
+               nullable=False)
+        batch_op.create_primary_key('pk_followers', ['follower_id', 'followed_id'])
+        batch_op.create_index('ix_followers_followed_id', ['followed_id', 'follower_id'], unique=False)
+
+    with op.batch_alter_table('like', schema=None) as batch_op:
+        batch_op.create_index('ix_like_tweet_id', ['tweet_id'], unique=False)
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('actor_count', sa.Integer(), server_default='1', nullable=False))
+        batch_op.create_index('ix_notification_user_created', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_notification_user_type_tweet', ['user_id', 'type', 'tweet_id'], unique=False)
+
+    with op.batch_alter_table('retweet', schema=None) as batch_op:
+        batch_op.create_index('ix_retweet_tweet_id', ['tweet_id'], unique=False)
+
+    with op.batch_alter_table('tweet', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('retweets_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_tweet_created', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_tweet_user_created', ['user_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('followers_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('following_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('tweets_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('unread_notifications_count', sa.Integer(), server_default='0', nullable=False))
+
+    # ### end Alembic commands ###
+
+    op.execute('UPDATE tweet SET '
+               'likes_count = (SELECT COUNT(*) FROM "like" WHERE "like".tweet_id = tweet.id), '
+               'retweets_count = (SELECT COUNT(*) FROM retweet WHERE retweet.tweet_id = tweet.id)')
+    op.execute('UPDATE "user" SET '
+               'followers_count = (SELECT COUNT(*) FROM followers WHERE followers.followed_id = "user".id), '
+               'following_count = (SELECT COUNT(*) FROM followers WHERE followers.follower_id = "user".id), '
+               'tweets_count = (SELECT COUNT(*) FROM tweet WHERE tweet.user_id = "user".id), '
+               'unread_notifications_count = (SELECT COUNT(*) FROM notification '
+               'WHERE notification.user_id = "user".id AND NOT notification.read)')
+    op.execute('INSERT INTO feed_entry (user_id, tweet_id, author_id, created_at) '
+               'SELECT user_id, id, user_id, created_at FROM tweet '
+               'UNION '
+               'SELECT followers.follower_id, tweet.id, tweet.user_id, tweet.created_at '
+               'FROM followers JOIN tweet ON tweet.user_id = followers.followed_id')
+
+    if bind.dialect.name == 'sqlite':
+        for statement in SEARCH_INDEX_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO tweet_fts(tweet_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO user_fts(user_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in ('tweet_fts_ai', 'tweet_fts_ad', 'tweet_fts_au', 'user_fts_ai', 'user_fts_ad', 'user_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute('DROP TABLE IF EXISTS tweet_fts')
+        op.execute('DROP TABLE IF EXISTS user_fts')
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('unread_notifications_count')
+        batch_op.drop_column('tweets_count')
+        batch_op.drop_column('following_count')
+        batch_op.drop_column('followers_count')
+
+    with op.batch_alter_table('tweet', schema=None) as batch_op:
+        batch_op.drop_index('ix_tweet_user_created')
+        batch_op.drop_index('ix_tweet_created')
+        batch_op.drop_column('retweets_count')
+        batch_op.drop_column('likes_count')
+
+    with op.batch_alter_table('retweet', schema=None) as batch_op:
+        batch_op.drop_index('ix_retweet_tweet_id')
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_user_type_tweet')
+        batch_op.drop_index('ix_notification_user_created')
+        batch_op.drop_column('actor_count')
+
+    with op.batch_alter_table('like', schema=None) as batch_op:
+        batch_op.drop_index('ix_like_tweet_id')
+
+    with op.batch_alter_table('followers', schema=None) as batch_op:
+        batch_op.drop_index('ix_followers_followed_id')
+        batch_op.drop_constraint('pk_followers', type_='primary')
+        batch_op.alter_column('followed_id',
+               existing_type=sa.INTEGER(),
+               nullable=True)
+        batch_op.alter_column('follower_id',
+               existing_type=sa.INTEGER(),
+               nullable=True)
+
+    with op.batch_alter_table('feed_entry', schema=None) as batch_op:
+        batch_op.drop_index('ix_feed_entry_user_created')
+        batch_op.drop_index('ix_feed_entry_user_author')
+
+    op.drop_table('feed_entry')
+    # ### end Alembic commands ###
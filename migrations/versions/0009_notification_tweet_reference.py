@@ -0,0 +1,40 @@
+"""notification tweet reference
+
+Drops the foreign key from notification.tweet_id to tweet, so notifications
+about tweets moved to the archive keep their reference instead of blocking
+the move. SQLite's foreign keys are unnamed; batch mode names them with
+NAMING_CONVENTION to drop one.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 20:52:10.604127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def tweet_foreign_key():
+    for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys('notification'):
+        if foreign_key['constrained_columns'] == ['tweet_id']:
+            return foreign_key['name'] or 'fk_notification_tweet_id_tweet'
+
+
+def upgrade():
+    with op.batch_alter_table('notification', schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(tweet_foreign_key(), type_='foreignkey')
+
+
+def downgrade():
+    # Fails while notifications refer to archived tweets
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.create_foreign_key('fk_notification_tweet_id_tweet', 'tweet', ['tweet_id'], ['id'])
@@ -3,6 +3,7 @@ class TwitterExplore {
     constructor() {
         this.currentTab = 'trending';
         this.currentSearchTab = 'top';
+        this.searchQuery = '';
         this.searchResults = null;
         this.isSearching = false;
         this.init();
@@ -43,6 +44,15 @@ class TwitterExplore {
         // Search functionality
         this.setupSearch();
         
+        // Later search pages, ending with archived tweets, load on scroll
+        window.addEventListener('scroll', Utils.throttle(() => {
+            if (window.innerHeight + window.scrollY >= document.body.offsetHeight - 1000) {
+                if (this.currentSearchTab === 'latest' && !this.isSearching && this.searchResults && this.searchResults.has_next) {
+                    this.loadMoreSearchResults();
+                }
+            }
+        }, 500));
+        
         // Refresh button
         const refreshBtn = document.getElementById('refreshBtn');
         if (refreshBtn) {
@@ -294,7 +304,7 @@ class TwitterExplore {
 
     async loadLatestTweets() {
         try {
-            const response = await Utils.makeRequest('/api/tweets?page=1&per_page=20');
+            const response = await Utils.makeRequest('/api/tweets?per_page=20&normalize=1');
             this.renderLatestTweets(response.tweets);
         } catch (error) {
             console.error('Error loading latest tweets:', error);
@@ -361,6 +371,7 @@ class TwitterExplore {
     }
 
     async performSearch(query) {
+        this.searchQuery = query;
         this.isSearching = true;
         this.showSearchResults();
         
@@ -388,6 +399,27 @@ class TwitterExplore {
         }
     }
 
+    async loadMoreSearchResults() {
+        const query = this.searchQuery;
+        this.isSearching = true;
+        try {
+            const response = await Utils.makeRequest(
+                `/api/search?q=${encodeURIComponent(query)}&cursor=${encodeURIComponent(this.searchResults.next_cursor)}`
+            );
+            // A newer search may have replaced the results meanwhile
+            if (query !== this.searchQuery) return;
+            this.searchResults.tweets.push(...response.tweets);
+            this.searchResults.has_next = response.has_next;
+            this.searchResults.next_cursor = response.next_cursor;
+            this.renderSearchResults(this.searchResults, this.currentSearchTab);
+        } catch (error) {
+            console.error('Error loading more search results:', error);
+            Utils.showNotification('Failed to load tweets', 'error');
+        } finally {
+            this.isSearching = false;
+        }
+    }
+
     renderSearchResults(results, tab = 'top') {
         const searchResultsContent = document.getElementById('searchResultsContent');
         if (!searchResultsContent) return;
@@ -1,7 +1,7 @@
 // Home page functionality
 class TwitterHome {
     constructor() {
-        this.currentPage = 1;
+        this.nextCursor = null;
         this.isLoading = false;
         this.hasMoreTweets = true;
         this.tweets = [];
@@ -15,6 +15,60 @@ class TwitterHome {
         this.loadSuggestedUsers();
         this.loadTrendingTopics();
         this.setupInfiniteScroll();
+        this.setupLiveUpdates();
+    }
+
+    setupLiveUpdates() {
+        this.stream = Utils.openStream({
+            tweet: (tweet) => this.prependTweet(tweet),
+            counts: (counts) => this.updateTweetCounts(counts),
+            notification: (event) => this.setNotificationCount(event.unread_count)
+        });
+        this.loadNotificationCount();
+    }
+
+    prependTweet(tweet) {
+        const tweetFeed = document.getElementById('tweetFeed');
+        if (!tweetFeed || this.tweets.some(t => t.id === tweet.id)) return;
+
+        if (this.tweets.length === 0) {
+            tweetFeed.innerHTML = '';
+        }
+
+        this.tweets.unshift(tweet);
+        const tweetElement = Utils.createTweetElement(tweet);
+        this.setupTweetActions(tweetElement, tweet);
+        tweetFeed.prepend(tweetElement);
+    }
+
+    updateTweetCounts(counts) {
+        const tweet = this.tweets.find(t => t.id === counts.tweet_id);
+        if (tweet) {
+            tweet.likes_count = counts.likes_count;
+            tweet.retweets_count = counts.retweets_count;
+        }
+
+        document.querySelectorAll(`.tweet[data-tweet-id="${counts.tweet_id}"]`).forEach(tweetElement => {
+            tweetElement.querySelector('.action-btn.like span').textContent = Utils.formatNumber(counts.likes_count);
+            tweetElement.querySelector('.action-btn.retweet span').textContent = Utils.formatNumber(counts.retweets_count);
+        });
+    }
+
+    async loadNotificationCount() {
+        try {
+            const response = await Utils.makeRequest('/api/notifications/unread-count');
+            this.setNotificationCount(response.unread_count);
+        } catch (error) {
+            console.error('Error loading notification count:', error);
+        }
+    }
+
+    setNotificationCount(count) {
+        const notificationCount = document.getElementById('notificationCount');
+        if (notificationCount) {
+            notificationCount.textContent = count;
+            notificationCount.style.display = count > 0 ? 'inline-block' : 'none';
+        }
     }
 
     setupEventHandlers() {
@@ -177,16 +231,17 @@ class TwitterHome {
         if (composeAvatar) composeAvatar.src = userData.avatar;
     }
 
-    async loadTweets(page = 1) {
+    async loadTweets(cursor = null) {
         if (this.isLoading) return;
         
         this.isLoading = true;
         this.showLoadingIndicator();
         
         try {
-            const response = await Utils.makeRequest(`/api/tweets?page=${page}&per_page=20`);
+            const before = cursor ? `&before=${encodeURIComponent(cursor)}` : '';
+            const response = await Utils.makeRequest(`/api/tweets?per_page=20&normalize=1${before}`);
             
-            if (page === 1) {
+            if (!cursor) {
                 this.tweets = response.tweets;
                 this.renderTweets();
             } else {
@@ -195,6 +250,7 @@ class TwitterHome {
             }
             
             this.hasMoreTweets = response.has_next;
+            this.nextCursor = response.next_cursor;
             this.updateLoadMoreButton();
             
         } catch (error) {
@@ -209,8 +265,7 @@ class TwitterHome {
     async loadMoreTweets() {
         if (!this.hasMoreTweets || this.isLoading) return;
         
-        this.currentPage++;
-        await this.loadTweets(this.currentPage);
+        await this.loadTweets(this.nextCursor);
     }
 
     renderTweets() {
@@ -377,9 +432,9 @@ class TwitterHome {
     }
 
     async refreshFeed() {
-        this.currentPage = 1;
+        this.nextCursor = null;
         this.hasMoreTweets = true;
-        await this.loadTweets(1);
+        await this.loadTweets();
         Utils.showNotification('Feed refreshed', 'success');
     }
 
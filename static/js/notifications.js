@@ -11,6 +11,18 @@ class TwitterNotifications {
         this.loadUserData();
         this.loadNotifications();
         this.loadTrendingTopics();
+        this.setupLiveUpdates();
+    }
+
+    setupLiveUpdates() {
+        this.stream = Utils.openStream({
+            notification: (event) => {
+                // Coalesced notifications arrive again with the same id
+                this.notifications = this.notifications.filter(n => n.id !== event.notification.id);
+                this.notifications.unshift(event.notification);
+                this.renderNotifications();
+            }
+        });
     }
 
     setupEventHandlers() {
@@ -202,8 +214,10 @@ class TwitterNotifications {
 
     async markAsRead(notification) {
         try {
-            // API call to mark notification as read
-            // For now, just update locally
+            await Utils.makeRequest('/api/notifications/read', {
+                method: 'POST',
+                body: JSON.stringify({ ids: [notification.id] })
+            });
             notification.read = true;
         } catch (error) {
             console.error('Error marking notification as read:', error);
@@ -4,6 +4,9 @@ class TwitterProfile {
         this.profileUser = null;
         this.currentTab = 'tweets';
         this.tweets = [];
+        this.nextCursor = null;
+        this.hasMoreTweets = false;
+        this.isLoading = false;
         this.init();
     }
 
@@ -37,6 +40,15 @@ class TwitterProfile {
         
         // Search
         this.setupSearch();
+        
+        // Infinite scroll for the tweets tab
+        window.addEventListener('scroll', Utils.throttle(() => {
+            if (window.innerHeight + window.scrollY >= document.body.offsetHeight - 1000) {
+                if (this.currentTab === 'tweets' && !this.isLoading && this.hasMoreTweets) {
+                    this.loadMoreProfileTweets();
+                }
+            }
+        }, 500));
     }
 
     setupNavigation() {
@@ -211,13 +223,36 @@ class TwitterProfile {
     }
 
     async loadProfileTweets() {
+        this.isLoading = true;
         try {
-            const response = await Utils.makeRequest(`/api/users/${this.profileUser.username}/tweets`);
+            const response = await Utils.makeRequest(`/api/users/${this.profileUser.username}/tweets?per_page=20&normalize=1`);
             this.tweets = response.tweets;
+            this.hasMoreTweets = response.has_next;
+            this.nextCursor = response.next_cursor;
             this.renderTweets(this.tweets);
         } catch (error) {
             console.error('Error loading profile tweets:', error);
             this.showEmptyState('Failed to load tweets');
+        } finally {
+            this.isLoading = false;
+        }
+    }
+
+    async loadMoreProfileTweets() {
+        this.isLoading = true;
+        try {
+            const response = await Utils.makeRequest(
+                `/api/users/${this.profileUser.username}/tweets?per_page=20&normalize=1&before=${encodeURIComponent(this.nextCursor)}`
+            );
+            this.tweets.push(...response.tweets);
+            this.hasMoreTweets = response.has_next;
+            this.nextCursor = response.next_cursor;
+            this.appendTweets(response.tweets);
+        } catch (error) {
+            console.error('Error loading more profile tweets:', error);
+            Utils.showNotification('Failed to load tweets', 'error');
+        } finally {
+            this.isLoading = false;
         }
     }
 
@@ -269,6 +304,17 @@ class TwitterProfile {
         });
     }
 
+    appendTweets(tweets) {
+        const profileContent = document.getElementById('profileContent');
+        if (!profileContent) return;
+
+        tweets.forEach(tweet => {
+            const tweetElement = Utils.createTweetElement(tweet);
+            this.setupTweetActions(tweetElement, tweet);
+            profileContent.appendChild(tweetElement);
+        });
+    }
+
     setupTweetActions(tweetElement, tweet) {
         const actionButtons = tweetElement.querySelectorAll('.action-btn');
         
@@ -60,6 +60,8 @@ class Utils {
             const response = await fetch(url, {
                 headers: {
                     'Content-Type': 'application/json',
+                    // msgpack is only asked for when a decoder has been loaded
+                    'Accept': window.MessagePack ? 'application/msgpack, application/json;q=0.9' : 'application/json',
                     ...options.headers
                 },
                 ...options
@@ -69,13 +71,45 @@ class Utils {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
-            return await response.json();
+            return Utils.denormalize(await Utils.decodeResponse(response));
         } catch (error) {
             console.error('Request error:', error);
             throw error;
         }
     }
 
+    static async decodeResponse(response) {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith('application/msgpack') && window.MessagePack) {
+            return window.MessagePack.decode(new Uint8Array(await response.arrayBuffer()));
+        }
+        return await response.json();
+    }
+
+    static denormalize(data) {
+        // Normalized feed pages (?normalize=1) list each author once under
+        // includes.users; put them back on the tweets for the renderers
+        if (data && data.includes && data.includes.users && Array.isArray(data.tweets)) {
+            const users = data.includes.users;
+            data.tweets.forEach(tweet => {
+                tweet.user = users[tweet.user_id];
+                if (tweet.quoted_tweet) tweet.quoted_tweet.user = users[tweet.quoted_tweet.user_id];
+            });
+        }
+        return data;
+    }
+
+    static openStream(handlers) {
+        // Server-sent events from /api/stream; EventSource reconnects on its own
+        if (typeof EventSource === 'undefined') return null;
+
+        const source = new EventSource('/api/stream');
+        Object.entries(handlers).forEach(([event, handler]) => {
+            source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+        });
+        return source;
+    }
+
     static debounce(func, wait) {
         let timeout;
         return function executedFunction(...args) {
@@ -125,10 +159,12 @@ class Utils {
                     <span class="tweet-time">${timeAgo}</span>
                 </div>
                 <div class="tweet-text">${linkedContent}</div>
+                ${this.createMediaMarkup(tweet.media)}
+                ${this.createQuotedTweetMarkup(tweet.quoted_tweet)}
                 <div class="tweet-actions">
                     <button class="action-btn reply" data-action="reply">
                         <i class="fas fa-comment"></i>
-                        <span>0</span>
+                        <span>${this.formatNumber(tweet.replies_count || 0)}</span>
                     </button>
                     <button class="action-btn retweet ${tweet.is_retweeted ? 'active' : ''}" data-action="retweet">
                         <i class="fas fa-retweet"></i>
@@ -148,6 +184,32 @@ class Utils {
         return tweetElement;
     }
 
+    static createMediaMarkup(media) {
+        if (!media || media.length === 0) return '';
+        // Width and height reserve the space before the thumbnails load
+        const images = media.map(item => `
+            <a href="${item.url}" target="_blank" rel="noopener">
+                <img src="${item.thumb_url}" width="${item.thumb_width}" height="${item.thumb_height}" alt="" loading="lazy">
+            </a>
+        `).join('');
+        return `<div class="tweet-media">${images}</div>`;
+    }
+
+    static createQuotedTweetMarkup(quoted) {
+        if (!quoted) return '';
+        return `
+            <div class="quoted-tweet" data-tweet-id="${quoted.id}">
+                <div class="tweet-header">
+                    <span class="tweet-user-name">${this.escapeHtml(quoted.user.display_name)}</span>
+                    <span class="tweet-username">@${this.escapeHtml(quoted.user.username)}</span>
+                    <span class="tweet-time">${this.formatTimeAgo(quoted.created_at)}</span>
+                </div>
+                <div class="tweet-text">${this.linkifyText(this.escapeHtml(quoted.content))}</div>
+                ${this.createMediaMarkup(quoted.media)}
+            </div>
+        `;
+    }
+
     static createUserSuggestionElement(user) {
         const suggestionElement = document.createElement('div');
         suggestionElement.className = 'user-suggestion';
@@ -182,6 +244,14 @@ class Utils {
                 iconClass = 'fas fa-user-plus';
                 iconType = 'follow';
                 break;
+            case 'reply':
+                iconClass = 'fas fa-comment';
+                iconType = 'default';
+                break;
+            case 'quote':
+                iconClass = 'fas fa-quote-right';
+                iconType = 'retweet';
+                break;
             default:
                 iconClass = 'fas fa-bell';
                 iconType = 'default';
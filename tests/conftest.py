@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+# app.py reads its configuration on import, so the scratch database and
+# storage directories have to be in the environment first
+TEST_DIR = tempfile.mkdtemp(prefix='twitter-clone-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_DIR, 'test.db')
+os.environ['ARCHIVE_DIR'] = os.path.join(TEST_DIR, 'archive')
+os.environ['MEDIA_DIR'] = os.path.join(TEST_DIR, 'media')
+os.environ['RATE_LIMITING'] = '0'
+
+import app as twitter  # noqa: E402
+
+EXTRA_TWEETS = 120
+
+@pytest.fixture(scope='session')
+def app():
+    with twitter.app.app_context():
+        twitter.db.create_all()
+        twitter.create_sample_data()
+        
+        # Enough tweets from every author, with likes, to fill the largest pages
+        users = twitter.User.query.order_by(twitter.User.id).all()
+        for index in range(EXTRA_TWEETS):
+            author = users[index % len(users)]
+            tweet = twitter.Tweet(content=f'Query count fixture tweet {index} #fixture', user_id=author.id)
+            twitter.db.session.add(tweet)
+            twitter.db.session.flush()
+            for liker in users[:index % len(users)]:
+                twitter.db.session.add(twitter.Like(user_id=liker.id, tweet_id=tweet.id))
+        twitter.db.session.commit()
+        twitter.reconcile_counters()
+        twitter.rebuild_feeds()
+    
+    yield twitter.app
+    
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    response = client.post('/api/login', json={'username': 'johndoe', 'password': 'password123'})
+    assert response.status_code == 200
+    return client
+
+@pytest.fixture
+def count_queries(app):
+    # Returns a function that makes a request with the caches emptied and
+    # reports how many SQL statements it executed
+    def count(client, url):
+        with app.app_context():
+            engine = twitter.db.engine
+        twitter.cache.clear()
+        twitter.memberships.clear()
+        
+        statements = []
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert response.status_code == 200, response.data
+        return response.get_json(), len(statements)
+    return count
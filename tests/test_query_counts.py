@@ -0,0 +1,21 @@
+import pytest
+
+# Listing endpoints serialize a page with a fixed number of grouped queries,
+# so the statement count must not grow with the page size (both pages here
+# are full, so neither continues into the archive)
+SMALL_PAGE = 5
+LARGE_PAGE = 20
+
+@pytest.mark.parametrize('url', [
+    '/api/tweets?per_page={}',
+    '/api/tweets?per_page={}&normalize=1',
+    '/api/search?q=fixture&per_page={}',
+    '/api/users/sarahchen/tweets?per_page={}',
+])
+def test_query_count_is_independent_of_page_size(client, count_queries, url):
+    small, small_count = count_queries(client, url.format(SMALL_PAGE))
+    large, large_count = count_queries(client, url.format(LARGE_PAGE))
+    
+    assert len(small['tweets']) == SMALL_PAGE
+    assert len(large['tweets']) == LARGE_PAGE
+    assert small_count == large_count